@@ -1,22 +1,76 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import requests
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 
 # ============ 配置区 ============
 BASE_URL = "http://localhost:20926"
+# 浏览器访问后端的地址（SSE 任务流由浏览器直接连接），后端不在本机时需设置为对外地址
+PUBLIC_BASE_URL = os.getenv("MARKIFY_PUBLIC_API_URL", BASE_URL)
+# 连接超时 / 读取超时（秒）
+REQUEST_TIMEOUT = (1, 5)
+# 文件上传的连接超时 / 读取超时（秒）：大文件时后端接收、写盘并创建任务需要更久，
+# 读取超时过短会在任务已创建后误报失败，重试还会产生重复任务
+UPLOAD_TIMEOUT = (1, 600)
+# 并发上传的最大线程数
+UPLOAD_WORKERS = 8
+
+# 订阅后端 SSE 任务流的前端组件
+_job_stream_component = components.declare_component(
+    "job_stream",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "job_stream")
+)
+
+
+def _create_session():
+    """
+    创建带连接池的 HTTP 会话，复用到后端的 TCP 连接，
+    避免每次请求都重新建立连接。
+    """
+    session = requests.Session()
+    # 后端短暂异常（5xx / 连接重置）时自动退避重试。
+    # 状态码与读取错误只对 GET 重试：POST 会创建任务，且上传请求体为流式，无法重放；
+    # 连接建立失败时请求尚未发出，所有方法都会重试。
+    retry = Retry(
+        total=3,
+        backoff_factor=0.25,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Streamlit 每次 rerun 都会重新执行脚本，将会话缓存在 session_state 中以便复用
+if "http" not in st.session_state:
+    st.session_state["http"] = _create_session()
+SESSION = st.session_state["http"]
 
 
 # ============ 工具函数 ============
 
+@st.cache_data(ttl=2.0, show_spinner=False)
 def fetch_jobs(page=0, limit=10):
     """
     从后端 /api/jobs 获取最新任务列表
     （请确保后端已实现 ?page=...&limit=... 分页参数）
+    结果会缓存 2 秒，避免每次 rerun 都请求后端。
     """
     url = f"{BASE_URL}/api/jobs?page={page}&limit={limit}"
     try:
-        resp = requests.get(url)
+        resp = SESSION.get(url, timeout=REQUEST_TIMEOUT)
         if resp.status_code == 200:
             return resp.json()  # 后端应返回一个任务列表 (list)
         else:
@@ -27,39 +81,109 @@ def fetch_jobs(page=0, limit=10):
         return []
 
 
+def subscribe_jobs(limit=10):
+    """
+    通过 SSE 订阅 /api/jobs/stream，后端任务状态变化时自动触发 rerun。
+    返回最近一次推送的任务列表；尚未收到推送或连接中断时返回 None。
+    """
+    return _job_stream_component(
+        url=f"{PUBLIC_BASE_URL}/api/jobs/stream?limit={limit}",
+        key="job_stream",
+        default=None
+    )
+
+
+def invalidate_jobs():
+    """清除任务列表缓存，在任务状态可能变化的操作后调用"""
+    fetch_jobs.clear()
+
+
 def upload_file(file, mode):
     """
     上传单个文件到后端，创建任务。
-    成功后立刻刷新页面，以获取最新的任务列表。
+    可在工作线程中调用，不直接操作 Streamlit 页面，返回 (是否成功, 提示信息)。
     """
-    files = {"file": file}
-    data = {"mode": mode}
+    # 使用 MultipartEncoder 流式发送文件内容，避免在内存中拼接完整的 multipart 请求体
+    encoder = MultipartEncoder(fields={
+        "file": (file.name, file, file.type or "application/octet-stream"),
+        "mode": mode
+    })
     try:
-        response = requests.post(f"{BASE_URL}/api/jobs", files=files, data=data)
+        response = SESSION.post(
+            f"{BASE_URL}/api/jobs",
+            data=encoder,
+            headers={"Content-Type": encoder.content_type},
+            timeout=UPLOAD_TIMEOUT
+        )
         if response.status_code == 202:
-            st.success(f"文件 `{file.name}` 上传成功，已加入任务队列。")
-            st.rerun()  # 替换为 st.rerun()
-        else:
-            st.error(f"文件 `{file.name}` 上传失败: {response.text}")
+            return True, f"文件 `{file.name}` 上传成功，已加入任务队列。"
+        return False, f"文件 `{file.name}` 上传失败: {response.text}"
     except requests.RequestException as e:
-        st.error(f"网络异常：{e}")
+        return False, f"网络异常：{e}"
 
 
 def upload_url(url, mode):
     """
     上传单个 URL 到后端，创建任务。
-    成功后立刻刷新页面，以获取最新的任务列表。
+    可在工作线程中调用，不直接操作 Streamlit 页面，返回 (是否成功, 提示信息)。
     """
     data = {"url": url, "mode": mode}
     try:
-        response = requests.post(f"{BASE_URL}/api/jobs/url", json=data)
+        response = SESSION.post(f"{BASE_URL}/api/jobs/url", json=data, timeout=REQUEST_TIMEOUT)
         if response.status_code == 202:
-            st.success(f"URL `{url}` 提交成功，已加入任务队列。")
-            st.rerun()  # 替换为 st.rerun()
-        else:
-            st.error(f"URL `{url}` 上传失败: {response.text}")
+            return True, f"URL `{url}` 提交成功，已加入任务队列。"
+        return False, f"URL `{url}` 上传失败: {response.text}"
     except requests.RequestException as e:
-        st.error(f"网络异常：{e}")
+        return False, f"网络异常：{e}"
+
+
+def submit_all(submit, items, mode):
+    """
+    并发提交多个文件或 URL，共享同一个连接池。
+    全部完成后在主线程统一展示结果；任务列表随后在同一次运行中由片段重新渲染，无需整页刷新。
+    """
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        results = list(executor.map(lambda item: submit(item, mode), items))
+
+    if any(ok for ok, _ in results):
+        invalidate_jobs()
+    for ok, message in results:
+        if ok:
+            st.success(message)
+        else:
+            st.error(message)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_result(job_id):
+    """
+    下载已完成任务的结果内容。
+    已完成任务的结果不会再变化，缓存后 rerun 时无需重复下载；
+    请求失败时抛出异常，失败结果不会被缓存。
+    """
+    response = SESSION.get(f"{BASE_URL}/api/jobs/{job_id}/result", timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def prefetch_results(jobs):
+    """
+    并发预取已完成任务的结果，填充 fetch_result 缓存，
+    后续逐行渲染时直接命中缓存，而不是串行逐个下载。
+    """
+    job_ids = [job["job_id"] for job in jobs if job["status"] == "completed"]
+    if len(job_ids) < 2:
+        return
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        list(executor.map(_prefetch_result, job_ids))
+
+
+def _prefetch_result(job_id):
+    try:
+        fetch_result(job_id)
+    except requests.RequestException:
+        # 渲染该行时会重新请求并展示错误
+        pass
 
 
 def show_file_entry(job):
@@ -100,21 +224,43 @@ def show_file_entry(job):
         # 如果已完成，提供下载
         if status == "completed":
             try:
-                result_response = requests.get(f"{BASE_URL}/api/jobs/{job['job_id']}/result")
-                if result_response.status_code == 200:
-                    st.download_button(
-                        label="下载",
-                        data=result_response.content,
-                        file_name=f"{job['filename']}.md",
-                        mime="text/markdown",
-                        key=f"download_{job['job_id']}"  # 添加唯一 key
-                    )
-                else:
-                    st.error("无法下载")
+                st.download_button(
+                    label="下载",
+                    data=fetch_result(job["job_id"]),
+                    file_name=f"{job['filename']}.md",
+                    mime="text/markdown",
+                    key=f"download_{job['job_id']}"  # 添加唯一 key
+                )
+            except requests.HTTPError:
+                st.error("无法下载")
             except requests.RequestException as e:
                 st.error(f"下载异常：{e}")
 
 
+@st.fragment
+def job_list_fragment():
+    """
+    右侧任务列表。作为独立片段运行：刷新按钮和 SSE 推送只重新渲染该区域，
+    左侧上传区的控件状态保持不变。
+    """
+    st.subheader("文件列表")
+
+    # 手动刷新按钮：点击本身会重新运行片段，清除缓存后下方即拉取最新列表
+    if st.button("刷新列表"):
+        invalidate_jobs()
+
+    # 优先使用 SSE 推送的任务列表，未连接或连接中断时回退到主动拉取
+    jobs = subscribe_jobs(limit=10)
+    if jobs is None:
+        jobs = fetch_jobs(page=0, limit=10)
+    if not jobs:
+        st.info("暂无任务，请上传后查看。")
+    else:
+        prefetch_results(jobs)
+        for job in jobs:
+            show_file_entry(job)
+
+
 # ============ 主函数 ============
 
 def main():
@@ -138,34 +284,20 @@ def main():
             accept_multiple_files=True
         )
         if uploaded_files and st.button("上传文件"):
-            for file in uploaded_files:
-                upload_file(file, mode)
+            submit_all(upload_file, uploaded_files, mode)
 
         # URL 上传
         st.subheader("URL 上传")
         file_urls = st.text_area("请输入文件 URL（每行一个）")
         if file_urls and st.button("提交 URL"):
-            for url in file_urls.strip().split("\n"):
-                if url:
-                    upload_url(url.strip(), mode)
+            urls = [url.strip() for url in file_urls.strip().split("\n") if url.strip()]
+            submit_all(upload_url, urls, mode)
 
         # 结果存储位置（移除 MinerU 引用）
         st.markdown(f"**解析结果存储路径**：`{os.path.expanduser('~')}/Markify`")
 
     with right_col:
-        st.subheader("文件列表")
-
-        # 手动刷新按钮
-        if st.button("刷新列表"):
-            st.rerun()  # 替换为 st.rerun()
-
-        # 从后端获取任务列表
-        jobs = fetch_jobs(page=0, limit=10)
-        if not jobs:
-            st.info("暂无任务，请上传后查看。")
-        else:
-            for job in jobs:
-                show_file_entry(job)
+        job_list_fragment()
 
 
 if __name__ == "__main__":
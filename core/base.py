@@ -1,4 +1,4 @@
-from typing import Any, Union
+from typing import Any, FrozenSet, Optional, Union
 
 
 class DocumentConverterResult:
@@ -12,11 +12,25 @@ class DocumentConverterResult:
 class DocumentConverter:
     """Abstract superclass of all DocumentConverters."""
 
+    # Lower-case file extensions this converter accepts, used by MarkItDown to skip
+    # converters that cannot handle a file. None means the converter decides from the
+    # input itself and is tried for every extension.
+    extensions: Optional[FrozenSet[str]] = None
+
+    # Whether convert_bytes is implemented. MarkItDown.convert_bytes hands such converters
+    # the content directly instead of writing it to a temporary file first.
+    supports_bytes: bool = False
+
     def convert(
             self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
         raise NotImplementedError()
 
+    def convert_bytes(
+            self, data: bytes, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        raise NotImplementedError()
+
 
 class FileConversionException(BaseException):
     pass
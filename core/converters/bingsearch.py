@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 
 from core.base import DocumentConverter, DocumentConverterResult
 from core.converters.custommarkdownify import _CustomMarkdownify
+from core.converters.html import HTML_EXTENSIONS
 
 
 class BingSerpConverter(DocumentConverter):
@@ -16,23 +17,40 @@ class BingSerpConverter(DocumentConverter):
     NOTE: It is better to use the Bing API
     """
 
+    extensions = HTML_EXTENSIONS
+    supports_bytes = True
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a Bing SERP
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".html", ".htm"]:
+        if not self._accepts(**kwargs):
             return None
-        url = kwargs.get("url", "")
-        if not re.search(r"^https://www\.bing\.com/search\?q=", url):
+
+        with open(local_path, "rt", encoding="utf-8") as fh:
+            return self._convert(fh.read(), **kwargs)
+
+    def convert_bytes(self, data, **kwargs) -> Union[None, DocumentConverterResult]:
+        # Bail if not a Bing SERP
+        if not self._accepts(**kwargs):
             return None
 
+        return self._convert(data.decode("utf-8"), **kwargs)
+
+    def _accepts(self, **kwargs) -> bool:
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in HTML_EXTENSIONS:
+            return False
+        url = kwargs.get("url", "")
+        return re.search(r"^https://www\.bing\.com/search\?q=", url) is not None
+
+    def _convert(self, html_content: str, **kwargs) -> Union[None, DocumentConverterResult]:
+        """Helper function that converts the HTML of a Bing SERP."""
         # Parse the query parameters
+        url = kwargs.get("url", "")
         parsed_params = parse_qs(urlparse(url).query)
         query = parsed_params.get("q", [""])[0]
 
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = BeautifulSoup(html_content, "html.parser")
 
         # Clean up some formatting
         for tptt in soup.find_all(class_="tptt"):
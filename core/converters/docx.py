@@ -11,6 +11,10 @@ class DocxConverter(HtmlConverter):
     Converts DOCX files to Markdown. Style information (e.g.m headings) and tables are preserved where possible.
     """
 
+    extensions = frozenset({".docx"})
+    # Binary format: only the HTML rendering step is shared with HtmlConverter
+    supports_bytes = False
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a DOCX
         extension = kwargs.get("file_extension", "")
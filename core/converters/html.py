@@ -5,16 +5,21 @@ from bs4 import BeautifulSoup
 from core.base import DocumentConverter, DocumentConverterResult
 from core.converters.custommarkdownify import _CustomMarkdownify
 
+HTML_EXTENSIONS = frozenset({".html", ".htm"})
+
 
 class HtmlConverter(DocumentConverter):
     """Anything with content type text/html"""
 
+    extensions = HTML_EXTENSIONS
+    supports_bytes = True
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
         # Bail if not html
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".html", ".htm"]:
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in HTML_EXTENSIONS:
             return None
 
         result = None
@@ -23,6 +28,16 @@ class HtmlConverter(DocumentConverter):
 
         return result
 
+    def convert_bytes(
+        self, data: bytes, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        # Bail if not html
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in HTML_EXTENSIONS:
+            return None
+
+        return self._convert(data.decode("utf-8"))
+
     def _convert(self, html_content: str) -> Union[None, DocumentConverterResult]:
         """Helper function that converts and HTML string."""
 
@@ -1,20 +1,34 @@
 import base64
 import mimetypes
+import mmap
+import os
+from functools import lru_cache
 from typing import Union
 
 from core.base import DocumentConverterResult
 from core.converters.media import MediaConverter
 
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+
+
+@lru_cache(maxsize=None)
+def _guess_content_type(extension):
+    """Guess (and cache) the image MIME type for a file extension."""
+    content_type, _ = mimetypes.guess_type("_dummy" + extension)
+    return content_type or "image/jpeg"
+
 
 class ImageConverter(MediaConverter):
     """
     Converts images to markdown via extraction of metadata (if `exiftool` is installed), OCR (if `easyocr` is installed), and description via a multimodal LLM (if an llm_client is configured).
     """
 
+    extensions = IMAGE_EXTENSIONS
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not an image
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".jpg", ".jpeg", ".png"]:
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in IMAGE_EXTENSIONS:
             return None
 
         md_content = ""
@@ -49,6 +63,7 @@ class ImageConverter(MediaConverter):
                     llm_client,
                     llm_model,
                     prompt=kwargs.get("llm_prompt"),
+                    source_url=kwargs.get("url"),
                 ).strip()
                 + "\n"
             )
@@ -65,18 +80,36 @@ class ImageConverter(MediaConverter):
             text_content=md_content,
         )
 
-    def _get_llm_description(self, local_path, extension, client, model, prompt=None):
+    def _get_llm_description(
+        self, local_path, extension, client, model, prompt=None, source_url=None
+    ):
         if prompt is None or prompt.strip() == "":
             prompt = "Write a detailed caption for this image."
 
-        data_uri = ""
+        # Images fetched from a public URL are passed by reference, so the provider downloads
+        # them itself and we skip the base64 payload. Fall back to an inline data URI only if
+        # the provider rejects the URL (HTTP 400: invalid image or unreachable URL); any other
+        # error (auth, rate limit, timeout) would fail the same way again, so it propagates.
+        if source_url and source_url.startswith(("http://", "https://")):
+            try:
+                return self._describe_image_url(source_url, client, model, prompt)
+            except Exception as e:
+                if getattr(e, "status_code", None) != 400:
+                    raise
+
+        # Encode straight from a memory map to avoid holding an extra copy of the file.
+        # Empty files cannot be mapped, so they get an empty payload instead.
         with open(local_path, "rb") as image_file:
-            content_type, encoding = mimetypes.guess_type("_dummy" + extension)
-            if content_type is None:
-                content_type = "image/jpeg"
-            image_base64 = base64.b64encode(image_file.read()).decode("utf-8")
-            data_uri = f"data:{content_type};base64,{image_base64}"
+            if os.fstat(image_file.fileno()).st_size == 0:
+                image_base64 = ""
+            else:
+                with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    image_base64 = base64.b64encode(mm).decode("ascii")
+        data_uri = f"data:{_guess_content_type(extension)};base64,{image_base64}"
+
+        return self._describe_image_url(data_uri, client, model, prompt)
 
+    def _describe_image_url(self, image_url, client, model, prompt):
         messages = [
             {
                 "role": "user",
@@ -85,7 +118,7 @@ class ImageConverter(MediaConverter):
                     {
                         "type": "image_url",
                         "image_url": {
-                            "url": data_uri,
+                            "url": image_url,
                         },
                     },
                 ],
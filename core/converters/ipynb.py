@@ -7,6 +7,9 @@ from core.base import DocumentConverter, DocumentConverterResult, FileConversion
 class IpynbConverter(DocumentConverter):
     """Converts Jupyter Notebook (.ipynb) files to Markdown."""
 
+    extensions = frozenset({".ipynb"})
+    supports_bytes = True
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
@@ -23,6 +26,16 @@ class IpynbConverter(DocumentConverter):
 
         return result
 
+    def convert_bytes(
+        self, data: bytes, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        # Bail if not ipynb
+        extension = kwargs.get("file_extension", "")
+        if extension.lower() != ".ipynb":
+            return None
+
+        return self._convert(json.loads(data.decode("utf-8")))
+
     def _convert(self, notebook_content: dict) -> Union[None, DocumentConverterResult]:
         """Helper function that converts notebook JSON content to Markdown."""
         try:
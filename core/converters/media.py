@@ -1,11 +1,85 @@
+import atexit
 import json
 import shutil
 import subprocess
+import threading
 from _warnings import warn
 
 from core.base import DocumentConverter
 
 
+class ExiftoolWorker:
+    """
+    A long-lived `exiftool -stay_open` process that serves metadata requests over stdin/stdout,
+    so the interpreter startup cost is paid once instead of once per file.
+    """
+
+    _SENTINEL = "{ready}"
+
+    def __init__(self, exiftool_path):
+        self.exiftool_path = exiftool_path
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._process = subprocess.Popen(
+            [self.exiftool_path, "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def _execute(self, *args):
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+        self._process.stdin.write("\n".join(args) + "\n-execute\n")
+        self._process.stdin.flush()
+
+        output = []
+        for line in self._process.stdout:
+            if line.strip() == self._SENTINEL:
+                return "".join(output)
+            output.append(line)
+        raise RuntimeError("exiftool exited unexpectedly")
+
+    def get_metadata(self, local_path):
+        with self._lock:
+            return json.loads(self._execute("-json", local_path))[0]
+
+    def close(self):
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                try:
+                    self._process.stdin.write("-stay_open\nFalse\n")
+                    self._process.stdin.flush()
+                    self._process.wait(timeout=5)
+                except Exception:
+                    self._process.kill()
+            self._process = None
+
+
+_exiftool_workers = {}
+_exiftool_workers_lock = threading.Lock()
+
+
+def get_exiftool_worker(exiftool_path):
+    """Return the shared ExiftoolWorker for the given exiftool executable."""
+    with _exiftool_workers_lock:
+        worker = _exiftool_workers.get(exiftool_path)
+        if worker is None:
+            worker = ExiftoolWorker(exiftool_path)
+            _exiftool_workers[exiftool_path] = worker
+        return worker
+
+
+@atexit.register
+def _close_exiftool_workers():
+    for worker in list(_exiftool_workers.values()):
+        worker.close()
+
+
 class MediaConverter(DocumentConverter):
     """
     Abstract class for multi-modal media (e.g., images and audio)
@@ -28,9 +102,6 @@ This warning will be removed in future releases.
             return None
         else:
             try:
-                result = subprocess.run(
-                    [exiftool_path, "-json", local_path], capture_output=True, text=True
-                ).stdout
-                return json.loads(result)[0]
+                return get_exiftool_worker(exiftool_path).get_metadata(local_path)
             except Exception:
                 return None
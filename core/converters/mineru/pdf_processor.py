@@ -1,15 +1,58 @@
+import multiprocessing
+import os
 import re
+import shutil
+import tempfile
 import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict
-
-from magic_pdf.config.enums import SupportedPdfParseMethod
-from magic_pdf.data.data_reader_writer import FileBasedDataWriter, FileBasedDataReader
-from magic_pdf.data.dataset import PymuDocDataset
-from magic_pdf.model.doc_analyze_by_custom_model import doc_analyze
+from types import SimpleNamespace
+from typing import Dict, List, Optional
 
 from core.converters.mineru.title_corrector import MarkdownTitleProcessor
 
+# 匹配 Markdown 中的图像链接，假设格式为 ![alt](images/xxxxx)
+# alt 为替换文本，name 为图像文件名（忽略 images/ 下的子目录）
+IMG_PATTERN = re.compile(r'!\[(?P<alt>[^\]]*)\]\(images/(?:[^)]*/)?(?P<name>[^)/]+)\)')
+# 图像链接必然包含的子串，用于快速跳过无图像的行
+IMG_MARKER = '](images/'
+
+# magic_pdf 依赖庞大的模型栈，首次处理PDF时才导入，缓存解析后的符号
+_MAGIC = None
+
+
+def _load_magic_pdf() -> SimpleNamespace:
+    """延迟导入 magic_pdf"""
+    global _MAGIC
+    if _MAGIC is None:
+        from magic_pdf.config.enums import SupportedPdfParseMethod
+        from magic_pdf.data.data_reader_writer import FileBasedDataWriter, FileBasedDataReader
+        from magic_pdf.data.dataset import PymuDocDataset
+        from magic_pdf.model.doc_analyze_by_custom_model import doc_analyze
+
+        _MAGIC = SimpleNamespace(
+            SupportedPdfParseMethod=SupportedPdfParseMethod,
+            FileBasedDataWriter=FileBasedDataWriter,
+            FileBasedDataReader=FileBasedDataReader,
+            PymuDocDataset=PymuDocDataset,
+            doc_analyze=doc_analyze,
+        )
+    return _MAGIC
+
+
+def _init_batch_worker(counter, devices: List[str]):
+    """批处理子进程初始化：轮询分配GPU，并预先导入 magic_pdf"""
+    if devices:
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        os.environ['CUDA_VISIBLE_DEVICES'] = devices[index % len(devices)]
+    _load_magic_pdf()
+
+
+def _process_in_worker(output_dir: str, base_url: str, pdf_path: str) -> Dict[str, str]:
+    return PDFProcessor(output_dir=output_dir, base_url=base_url).process(pdf_path)
+
 
 class PDFProcessor:
     """PDF文档处理管道"""
@@ -31,32 +74,59 @@ class PDFProcessor:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF文件不存在: {pdf_path}")
 
+        magic = _load_magic_pdf()
         name_stem = pdf_path.stem
         writers = {
-            'image': FileBasedDataWriter(str(self.image_dir)),
-            'markdown': FileBasedDataWriter(str(self.output_dir))
+            'image': magic.FileBasedDataWriter(str(self.image_dir)),
+            'markdown': magic.FileBasedDataWriter(str(self.output_dir))
         }
 
         # 读取并解析PDF
-        pdf_content = FileBasedDataReader("").read(str(pdf_path))
-        dataset = PymuDocDataset(pdf_content)
+        pdf_content = magic.FileBasedDataReader("").read(str(pdf_path))
+        dataset = magic.PymuDocDataset(pdf_content)
 
         # 执行解析流程
-        if dataset.classify() == SupportedPdfParseMethod.OCR:
-            result = dataset.apply(doc_analyze, ocr=True).pipe_ocr_mode(writers['image'])
+        if dataset.classify() == magic.SupportedPdfParseMethod.OCR:
+            result = dataset.apply(magic.doc_analyze, ocr=True).pipe_ocr_mode(writers['image'])
         else:
-            result = dataset.apply(doc_analyze, ocr=False).pipe_txt_mode(writers['image'])
+            result = dataset.apply(magic.doc_analyze, ocr=False).pipe_txt_mode(writers['image'])
 
         # 生成输出文件
         output_files = self._generate_outputs(result, writers, name_stem)
 
-        # 自动修正标题层级
-        self._adjust_title_levels(output_files['markdown'])
-
-        self._replace_image_paths(output_files['markdown'], self.base_url)
+        # 一次遍历完成标题层级修正和图像路径替换
+        self._rewrite_markdown(output_files['markdown'])
 
         return output_files
 
+    def process_batch(self, pdf_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        多进程并行处理多个PDF，结果顺序与输入一致
+
+        Args:
+            pdf_paths: PDF文件路径列表
+            max_workers: 最大进程数，默认为 min(文件数, CPU核数)
+        """
+        if not pdf_paths:
+            return []
+        if max_workers is None:
+            max_workers = min(len(pdf_paths), os.cpu_count() or 1)
+
+        # 指定了 CUDA_VISIBLE_DEVICES 时，各子进程轮流绑定其中一张卡
+        devices = [d for d in os.getenv('CUDA_VISIBLE_DEVICES', '').split(',') if d.strip()]
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=ctx,
+                initializer=_init_batch_worker,
+                initargs=(ctx.Value('i', 0), devices)
+        ) as executor:
+            futures = [
+                executor.submit(_process_in_worker, str(self.output_dir), self.base_url, str(path))
+                for path in pdf_paths
+            ]
+            return [future.result() for future in futures]
+
     def _generate_outputs(self, result, writers, name_stem: str) -> Dict[str, str]:
         """生成所有输出文件"""
         # 生成原始Markdown
@@ -73,24 +143,37 @@ class PDFProcessor:
             # 'middle_json': str(self.output_dir / f"{name_stem}_middle.json")
         }
 
-    def _replace_image_paths(self, md_path: str, base_url: str):
-        """替换Markdown文件中的本地图像路径为HTTP URL"""
-        with open(md_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # 匹配 Markdown 中的图像链接，假设格式为 ![alt](images/xxxxx)
-        pattern = r'!\[.*?\]\((images/.*?)\)'
-        replacement = lambda m: f'![{m.group(0).split("]")[0].split("[")[1]}]({urllib.parse.urljoin(base_url, "images/")}{m.group(1).split("/")[-1]})'
-        new_content = re.sub(pattern, replacement, content)
-
-        # 将修改后的内容写回文件
-        with open(md_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-
-    def _adjust_title_levels(self, md_path: str):
-        """执行Markdown标题修正"""
-        processor = MarkdownTitleProcessor()
-        processor.process_file(md_path)
+    def _rewrite_markdown(self, md_path: str):
+        """逐行修正标题层级，并将本地图像路径替换为HTTP URL"""
+        title_processor = MarkdownTitleProcessor()
+        image_prefix = urllib.parse.urljoin(self.base_url, "images/")
+        replacement = lambda m: f"![{m['alt']}]({image_prefix}{m['name']})"
+
+        # 写入同目录临时文件后原子替换，文件只读写一次
+        with open(md_path, 'r', encoding='utf-8') as fin, tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', delete=False, dir=os.path.dirname(md_path) or None
+        ) as fout:
+            changed = False
+            try:
+                for line in fin:
+                    new_line = title_processor.process_line(line)
+                    # 先做子串判断，没有图像引用的行不进入正则替换
+                    if IMG_MARKER in new_line:
+                        new_line = IMG_PATTERN.sub(replacement, new_line)
+                    changed = changed or new_line != line
+                    fout.write(new_line)
+            except BaseException:
+                fout.close()
+                os.unlink(fout.name)
+                raise
+
+        # 内容没有变化时保留原文件
+        if changed:
+            # 临时文件创建时权限为 0600，替换前沿用原文件的权限
+            shutil.copymode(md_path, fout.name)
+            os.replace(fout.name, md_path)
+        else:
+            os.unlink(fout.name)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,60 @@
+import os
 import re
+import shutil
+import tempfile
 from typing import List, Tuple, Optional
 from pathlib import Path
 
+# 默认支持中英文混合标题模式，格式为[(正则模式, 基准层级), ...]
+DEFAULT_TITLE_PATTERNS = [
+    # 中文章节模式
+    (r'^(第[一二三四五六七八九十百]+章)\s*[:：]?\s*.+', 1),
+    (r'^(第[一二三四五六七八九十百]+节)\s*[:：]?\s*.+', 2),
+    (r'^【.+】\s*.+', 2),
+
+    # 英文章节模式
+    (r'^(Chapter|CHAPTER)\s+\d+\.?\s*[:-]?\s*.+', 1),
+    (r'^(Section|SECTION)\s+\d+\.?\d*\s*[:-]?\s*.+', 2),
+
+    # 数字层级模式
+    (r'^\d+(?![.]\d)', 1),  # 单独数字开头：1
+    (r'^\d+\.\d+(?![.]\d)', 2),  # 二级编号：1.1
+    (r'^\d+\.\d+\.\d+', 3),  # 三级编号：1.1.1
+    (r'^\d+\.\d+\.\d+\.\d+', 4),  # 四级编号：1.1.1.1
+
+    # 特殊标识
+    (r'^(※|◆|►)\s*.+', 3),  # 特殊符号标题
+    (r'^(Note|Warning):\s*.+', 4)  # 提示类标题
+]
+
+# 模块加载时预编译，避免每次处理都重新编译
+TITLE_RE = re.compile(r'^(#+)\s+(.+)$')
+CLEAN_HEAD = re.compile(r'^[【《〈（(]')
+CLEAN_TAIL = re.compile(r'[】》〉）):.]$')
+WHITESPACE_RE = re.compile(r'\s')
+
+# 各级标题前缀，按层级下标取用
+HEADING_PREFIXES = ["", "# ", "## ", "### ", "#### ", "##### ", "###### "]
+
+
+def _compile_title_patterns(title_patterns: List[Tuple[str, int]]):
+    """
+    将所有标题模式合并为一个带命名分组的正则，一次匹配即可确定层级。
+    分支按列表顺序尝试，与逐个匹配的优先级一致。
+
+    Returns:
+        (合并后的正则, 分组名到基准层级的映射)
+    """
+    combined = re.compile(
+        "|".join(f"(?P<lvl{i}>{pattern})" for i, (pattern, _) in enumerate(title_patterns)),
+        re.IGNORECASE
+    )
+    levels = {f"lvl{i}": level for i, (_, level) in enumerate(title_patterns)}
+    return combined, levels
+
+
+DEFAULT_COMBINED_PATTERN, DEFAULT_PATTERN_LEVELS = _compile_title_patterns(DEFAULT_TITLE_PATTERNS)
+
 
 class MarkdownTitleProcessor:
     """智能Markdown标题层级处理器"""
@@ -13,33 +66,14 @@ class MarkdownTitleProcessor:
         Args:
             title_patterns: 自定义标题模式列表，格式为[(正则模式, 基准层级), ...]
         """
-        # 默认支持中英文混合标题模式
-        self.title_patterns = title_patterns or [
-            # 中文章节模式
-            (r'^(第[一二三四五六七八九十百]+章)\s*[:：]?\s*.+', 1),
-            (r'^(第[一二三四五六七八九十百]+节)\s*[:：]?\s*.+', 2),
-            (r'^【.+】\s*.+', 2),
-
-            # 英文章节模式
-            (r'^(Chapter|CHAPTER)\s+\d+\.?\s*[:-]?\s*.+', 1),
-            (r'^(Section|SECTION)\s+\d+\.?\d*\s*[:-]?\s*.+', 2),
-
-            # 数字层级模式
-            (r'^\d+(?![.]\d)', 1),  # 单独数字开头：1
-            (r'^\d+\.\d+(?![.]\d)', 2),  # 二级编号：1.1
-            (r'^\d+\.\d+\.\d+', 3),  # 三级编号：1.1.1
-            (r'^\d+\.\d+\.\d+\.\d+', 4),  # 四级编号：1.1.1.1
-
-            # 特殊标识
-            (r'^(※|◆|►)\s*.+', 3),  # 特殊符号标题
-            (r'^(Note|Warning):\s*.+', 4)  # 提示类标题
-        ]
-
-        # 编译正则表达式
-        self.compiled_patterns = [
-            (re.compile(pattern, re.IGNORECASE), level)
-            for pattern, level in self.title_patterns
-        ]
+        if title_patterns:
+            self.title_patterns = title_patterns
+            self.combined_pattern, self.pattern_levels = _compile_title_patterns(title_patterns)
+        else:
+            # 默认模式共享模块级预编译结果
+            self.title_patterns = DEFAULT_TITLE_PATTERNS
+            self.combined_pattern = DEFAULT_COMBINED_PATTERN
+            self.pattern_levels = DEFAULT_PATTERN_LEVELS
 
         # 层级栈管理
         self.level_stack = [0]  # [当前层级，父层级，祖父层级...]
@@ -47,8 +81,8 @@ class MarkdownTitleProcessor:
     def _clean_title(self, title: str) -> str:
         """清洗标题内容"""
         # 移除常见干扰符号
-        title = re.sub(r'^[【《〈（(]', '', title)
-        title = re.sub(r'[】》〉）):.]$', '', title)
+        title = CLEAN_HEAD.sub('', title)
+        title = CLEAN_TAIL.sub('', title)
         # 去除首尾特殊符号
         return title.strip('※★▪•·\t ')
 
@@ -57,9 +91,9 @@ class MarkdownTitleProcessor:
         clean_title = self._clean_title(title)
 
         # 优先匹配预定义模式
-        for pattern, base_level in self.compiled_patterns:
-            if pattern.match(clean_title):
-                return self._calculate_relative_level(base_level)
+        match = self.combined_pattern.match(clean_title)
+        if match:
+            return self._calculate_relative_level(self.pattern_levels[match.lastgroup])
 
         # 无匹配时根据上下文推断
         return self._infer_level_from_context(clean_title)
@@ -80,14 +114,18 @@ class MarkdownTitleProcessor:
     def _infer_level_from_context(self, title: str) -> int:
         """根据上下文推断层级"""
         # 根据标题长度和内容特征推断
-        if len(title) < 15 and not re.search(r'\s', title):
+        if len(title) < 15 and not WHITESPACE_RE.search(title):
             return min(len(self.level_stack) + 1, 6)
         return max(len(self.level_stack), 1)
 
     def process_line(self, line: str) -> str:
         """处理单行Markdown文本"""
+        # 绝大多数行不是标题，先用前缀判断跳过正则匹配
+        if not line.lstrip().startswith('#'):
+            return line
+
         # 匹配标题行
-        match = re.match(r'^(#+)\s+(.+)$', line.strip())
+        match = TITLE_RE.match(line.strip())
         if not match:
             return line
 
@@ -104,22 +142,27 @@ class MarkdownTitleProcessor:
         else:
             self.level_stack = self.level_stack[:new_level]
 
-        return f"{'#' * new_level} {title_content}\n"
+        return f"{HEADING_PREFIXES[new_level]}{title_content}\n"
 
     def process_file(self, input_path: str, output_path: Optional[str] = None):
         """处理整个Markdown文件"""
         input_file = Path(input_path)
         output_file = Path(output_path) if output_path else input_file
 
-        with input_file.open('r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        processed_lines = []
-        for line in lines:
-            processed_lines.append(self.process_line(line))
-
-        with output_file.open('w', encoding='utf-8') as f:
-            f.writelines(processed_lines)
+        # 逐行流式处理写入临时文件，完成后原子替换，内存占用与文件大小无关
+        with input_file.open('r', encoding='utf-8') as fin, tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', delete=False, dir=output_file.parent
+        ) as fout:
+            try:
+                for line in fin:
+                    fout.write(self.process_line(line))
+            except BaseException:
+                fout.close()
+                os.unlink(fout.name)
+                raise
+        # 临时文件创建时权限为 0600，替换前沿用原文件的权限
+        shutil.copymode(output_file if output_file.exists() else input_file, fout.name)
+        os.replace(fout.name, output_file)
 
 
 if __name__ == '__main__':
@@ -13,6 +13,8 @@ class OutlookMsgConverter(DocumentConverter):
     - Email body content
     """
 
+    extensions = frozenset({".msg"})
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
@@ -3,13 +3,17 @@ from pathlib import Path
 
 from core.base import DocumentConverter, DocumentConverterResult, FileConversionException
 
+PDF_EXTENSIONS = frozenset({".pdf"})
+
 class PdfConverter(DocumentConverter):
     """默认PDF解析器（基于pdfminer）"""
 
+    extensions = PDF_EXTENSIONS
+
     def convert(self, local_path: str, **kwargs) -> Union[None, DocumentConverterResult]:
         # 检查文件扩展名
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() != ".pdf":
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in PDF_EXTENSIONS:
             return None
         try:
             import pdfminer.high_level
@@ -23,17 +27,21 @@ class PdfConverter(DocumentConverter):
 class AdvancedPdfConverter(DocumentConverter):
     """高级PDF解析器（待实现）"""
 
+    extensions = PDF_EXTENSIONS
+
     def convert(self, local_path: str, **kwargs) -> DocumentConverterResult:
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() != ".pdf":
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in PDF_EXTENSIONS:
             return None
         raise NotImplementedError("高级解析模式尚未实现")
 
 class CloudPdfConverter(DocumentConverter):
     """云端PDF解析器（待实现）"""
 
+    extensions = PDF_EXTENSIONS
+
     def convert(self, local_path: str, **kwargs) -> DocumentConverterResult:
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() != ".pdf":
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in PDF_EXTENSIONS:
             return None
         raise NotImplementedError("云端模式尚未实现")
\ No newline at end of file
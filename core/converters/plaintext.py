@@ -1,33 +1,54 @@
 import mimetypes
 from typing import Any, Union
 
-from charset_normalizer import from_path
+from charset_normalizer import from_bytes, from_path
 
 from core.base import DocumentConverter, DocumentConverterResult
 
+TEXT_CONTENT_TYPE_PREFIXES = ("text/", "application/json")
+
 
 class PlainTextConverter(DocumentConverter):
     """Anything with content type text/plain"""
 
+    supports_bytes = True
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
-        # Guess the content type from any file extension that might be around
-        content_type, _ = mimetypes.guess_type(
-            "__placeholder" + kwargs.get("file_extension", "")
+        # Only accept text files
+        if not self._is_text(kwargs.get("file_extension", "")):
+            return None
+
+        # Most text inputs are UTF-8: decode directly and only fall back to
+        # charset detection when that fails
+        try:
+            with open(local_path, "r", encoding="utf-8-sig") as fh:
+                text_content = fh.read()
+        except UnicodeDecodeError:
+            text_content = str(from_path(local_path).best())
+        return DocumentConverterResult(
+            title=None,
+            text_content=text_content,
         )
 
+    def convert_bytes(
+        self, data: bytes, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
         # Only accept text files
-        if content_type is None:
-            return None
-        elif all(
-            not content_type.lower().startswith(type_prefix)
-            for type_prefix in ["text/", "application/json"]
-        ):
+        if not self._is_text(kwargs.get("file_extension", "")):
             return None
 
-        text_content = str(from_path(local_path).best())
+        try:
+            text_content = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            text_content = str(from_bytes(data).best())
         return DocumentConverterResult(
             title=None,
             text_content=text_content,
         )
+
+    def _is_text(self, extension: str) -> bool:
+        """Guess the content type from any file extension that might be around."""
+        content_type, _ = mimetypes.guess_type("__placeholder" + extension)
+        return content_type is not None and content_type.lower().startswith(TEXT_CONTENT_TYPE_PREFIXES)
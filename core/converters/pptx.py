@@ -13,6 +13,10 @@ class PptxConverter(HtmlConverter):
     Converts PPTX files to Markdown. Supports heading, tables and images with alt text.
     """
 
+    extensions = frozenset({".pptx"})
+    # Binary format: only the HTML rendering step is shared with HtmlConverter
+    supports_bytes = False
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a PPTX
         extension = kwargs.get("file_extension", "")
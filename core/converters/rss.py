@@ -7,16 +7,20 @@ from bs4 import BeautifulSoup
 from core.base import DocumentConverter, DocumentConverterResult
 from core.converters.custommarkdownify import _CustomMarkdownify
 
+RSS_EXTENSIONS = frozenset({".xml", ".rss", ".atom"})
+
 
 class RSSConverter(DocumentConverter):
     """Convert RSS / Atom type to markdown"""
 
+    extensions = RSS_EXTENSIONS
+
     def convert(
         self, local_path: str, **kwargs
     ) -> Union[None, DocumentConverterResult]:
         # Bail if not RSS type
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".xml", ".rss", ".atom"]:
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in RSS_EXTENSIONS:
             return None
         try:
             doc = minidom.parse(local_path)
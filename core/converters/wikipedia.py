@@ -5,26 +5,45 @@ from bs4 import BeautifulSoup
 
 from core.base import DocumentConverter, DocumentConverterResult
 from core.converters.custommarkdownify import _CustomMarkdownify
+from core.converters.html import HTML_EXTENSIONS
 
 
 class WikipediaConverter(DocumentConverter):
     """Handle Wikipedia pages separately, focusing only on the main document content."""
 
+    extensions = HTML_EXTENSIONS
+    supports_bytes = True
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
         # Bail if not Wikipedia
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".html", ".htm"]:
+        if not self._accepts(**kwargs):
             return None
-        url = kwargs.get("url", "")
-        if not re.search(r"^https?:\/\/[a-zA-Z]{2,3}\.wikipedia.org\/", url):
+
+        with open(local_path, "rt", encoding="utf-8") as fh:
+            return self._convert(fh.read())
+
+    def convert_bytes(
+        self, data: bytes, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        # Bail if not Wikipedia
+        if not self._accepts(**kwargs):
             return None
 
+        return self._convert(data.decode("utf-8"))
+
+    def _accepts(self, **kwargs: Any) -> bool:
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in HTML_EXTENSIONS:
+            return False
+        url = kwargs.get("url", "")
+        return re.search(r"^https?:\/\/[a-zA-Z]{2,3}\.wikipedia.org\/", url) is not None
+
+    def _convert(self, html_content: str) -> Union[None, DocumentConverterResult]:
+        """Helper function that converts the HTML of a Wikipedia page."""
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = BeautifulSoup(html_content, "html.parser")
 
         # Remove javascript and style blocks
         for script in soup(["script", "style"]):
@@ -11,6 +11,10 @@ class XlsxConverter(HtmlConverter):
     Converts XLSX files to Markdown, with each sheet presented as a separate Markdown table.
     """
 
+    extensions = frozenset({".xlsx"})
+    # Binary format: only the HTML rendering step is shared with HtmlConverter
+    supports_bytes = False
+
     def convert(self, local_path, **kwargs) -> Union[None, DocumentConverterResult]:
         # Bail if not a XLSX
         extension = kwargs.get("file_extension", "")
@@ -15,26 +15,49 @@ except ModuleNotFoundError:
 
 
 from core.base import DocumentConverter, DocumentConverterResult
+from core.converters.html import HTML_EXTENSIONS
 
 
 class YouTubeConverter(DocumentConverter):
     """Handle YouTube specially, focusing on the video title, description, and transcript."""
 
+    extensions = HTML_EXTENSIONS
+    supports_bytes = True
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
         # Bail if not YouTube
-        extension = kwargs.get("file_extension", "")
-        if extension.lower() not in [".html", ".htm"]:
+        if not self._accepts(**kwargs):
             return None
-        url = kwargs.get("url", "")
-        if not url.startswith("https://www.youtube.com/watch?"):
+
+        with open(local_path, "rt", encoding="utf-8") as fh:
+            return self._convert(fh.read(), **kwargs)
+
+    def convert_bytes(
+        self, data: bytes, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        # Bail if not YouTube
+        if not self._accepts(**kwargs):
             return None
 
+        return self._convert(data.decode("utf-8"), **kwargs)
+
+    def _accepts(self, **kwargs: Any) -> bool:
+        extension = kwargs.get("file_extension", "").lower()
+        if extension not in HTML_EXTENSIONS:
+            return False
+        url = kwargs.get("url", "")
+        return url.startswith("https://www.youtube.com/watch?")
+
+    def _convert(
+        self, html_content: str, **kwargs: Any
+    ) -> Union[None, DocumentConverterResult]:
+        """Helper function that converts the HTML of a YouTube watch page."""
+        url = kwargs.get("url", "")
+
         # Parse the file
-        soup = None
-        with open(local_path, "rt", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
+        soup = BeautifulSoup(html_content, "html.parser")
 
         # Read the meta tags
         assert soup.title is not None and soup.title.string is not None
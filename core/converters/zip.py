@@ -45,6 +45,8 @@ class ZipConverter(DocumentConverter):
     - Cleans up temporary files after processing
     """
 
+    extensions = frozenset({".zip"})
+
     def convert(
         self, local_path: str, **kwargs: Any
     ) -> Union[None, DocumentConverterResult]:
@@ -98,6 +100,8 @@ class ZipConverter(DocumentConverter):
                     # Update kwargs for the file
                     file_kwargs = kwargs.copy()
                     file_kwargs["file_extension"] = file_extension
+                    # The URL (if any) is the archive's, not the extracted file's
+                    file_kwargs.pop("url", None)
                     file_kwargs["_parent_converters"] = parent_converters
 
                     # Try converting the file using available converters
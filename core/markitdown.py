@@ -1,17 +1,19 @@
 # type: ignore
-import copy
+import functools
 import mimetypes
 import os
 import re
 import tempfile
 import traceback
 from pathlib import Path
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 # File-format detection
 import puremagic
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core.base import DocumentConverterResult, DocumentConverter, FileConversionException, UnsupportedFormatException
 from core.converters.bingsearch import BingSerpConverter
@@ -31,6 +33,85 @@ from core.converters.xlsx import XlsxConverter
 from core.converters.youtube import YouTubeConverter
 from core.converters.zip import ZipConverter
 
+# Chunk size used when copying streams and downloads to temporary files
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# Block size used when skipping leading whitespace before retrying puremagic
+_MAGIC_HEAD_SIZE = 4096
+
+# Filename in a Content-Disposition header, with or without quotes
+_CONTENT_DISPOSITION_FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+
+# Load the MIME type database once at import rather than on the first lookup
+mimetypes.init()
+
+# Collapses runs of blank lines when normalizing converter output
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _guess_ext_magic_cached(path, size, mtime_ns, inode):
+    """Guess extensions with puremagic. Errors propagate (and are therefore not cached)."""
+    # Use puremagic to guess
+    guesses = puremagic.magic_file(path)
+
+    # Fix for: https://github.com/microsoft/markitdown/issues/222
+    # If there are no guesses, then try again after trimming leading ASCII whitespaces.
+    # ASCII whitespace characters are those byte values in the sequence b' \t\n\r\x0b\f'
+    # (space, tab, newline, carriage return, vertical tab, form feed).
+    if len(guesses) == 0:
+        with open(path, "rb") as file:
+            # Find the first non-whitespace byte block by block instead of byte by byte
+            offset = 0
+            while True:
+                block = file.read(_MAGIC_HEAD_SIZE)
+                if not block:  # End of file
+                    break
+                stripped = block.lstrip(b" \t\n\r\x0b\f")
+                if stripped:
+                    file.seek(offset + len(block) - len(stripped))
+                    try:
+                        guesses = puremagic.magic_stream(file)
+                    except puremagic.main.PureError:
+                        pass
+                    break
+                offset += len(block)
+
+    return _magic_extensions(guesses)
+
+
+def _guess_ext_magic_bytes(data):
+    """Same as _guess_ext_magic_cached, for content that is already in memory."""
+    try:
+        # puremagic only inspects the header and footer, so there is no need to copy the data
+        guesses = puremagic.magic_string(data)
+    except (puremagic.main.PureError, ValueError):
+        guesses = []
+
+    # Fix for: https://github.com/microsoft/markitdown/issues/222
+    if len(guesses) == 0:
+        stripped = data.lstrip(b" \t\n\r\x0b\f")
+        if stripped and len(stripped) != len(data):
+            try:
+                guesses = puremagic.magic_string(stripped)
+            except (puremagic.main.PureError, ValueError):
+                pass
+
+    return _magic_extensions(guesses)
+
+
+def _magic_extensions(guesses):
+    """Turn puremagic guesses into a tuple of unique dotted extensions."""
+    extensions = list()
+    for g in guesses:
+        ext = g.extension.strip()
+        if len(ext) > 0:
+            if not ext.startswith("."):
+                ext = "." + ext
+            if ext not in extensions:
+                extensions.append(ext)
+    return tuple(extensions)
+
 
 class MarkItDown:
     """(In preview) An extremely simple text-based document reader, suitable for LLM use.
@@ -47,7 +128,7 @@ class MarkItDown:
     ):
         self.mode = mode
         if requests_session is None:
-            self._requests_session = requests.Session()
+            self._requests_session = self._create_requests_session()
         else:
             self._requests_session = requests_session
 
@@ -60,6 +141,11 @@ class MarkItDown:
         self._exiftool_path = exiftool_path
 
         self._page_converters: List[DocumentConverter] = []
+        # Candidate converters per declared extension, in priority order, kept up to date by
+        # register_page_converter. Converters without declared extensions are "generic" and
+        # are candidates for every extension.
+        self._converters_by_extension: Dict[str, List[DocumentConverter]] = {}
+        self._generic_converters: List[DocumentConverter] = []
 
         # Register converters for successful browsing operations
         # Later registrations are tried first / take higher priority than earlier registrations
@@ -94,6 +180,19 @@ class MarkItDown:
         self.register_page_converter(ZipConverter())
         self.register_page_converter(OutlookMsgConverter())
 
+    @staticmethod
+    def _create_requests_session() -> requests.Session:
+        """Create the default session, with a larger connection pool and retries for transient errors."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def convert(
         self, source: Union[str, requests.Response, Path], **kwargs: Any
     ) -> DocumentConverterResult:  # TODO: deal with kwargs
@@ -147,33 +246,51 @@ class MarkItDown:
         extensions = [ext] if ext is not None else []
 
         # Save the file locally to a temporary file. It will be deleted before this method exits
-        handle, temp_path = tempfile.mkstemp()
-        fh = os.fdopen(handle, "wb")
-        result = None
+        fh = tempfile.NamedTemporaryFile(delete=False)
+        temp_path = fh.name
         try:
             # Write to the temporary file
-            content = stream.read()
-            if isinstance(content, str):
-                fh.write(content.encode("utf-8"))
-            else:
-                fh.write(content)
-            fh.close()
+            with fh:
+                while True:
+                    chunk = stream.read(_COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    fh.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
 
             # Use puremagic to check for more extension options
             for g in self._guess_ext_magic(temp_path):
                 self._append_ext(extensions, g)
 
             # Convert
-            result = self._convert(temp_path, extensions, **kwargs)
+            return self._convert(temp_path, extensions, **kwargs)
         # Clean up
         finally:
-            try:
-                fh.close()
-            except Exception:
-                pass
             os.unlink(temp_path)
 
-        return result
+    def convert_bytes(
+        self, data: bytes, hint_ext: Optional[str] = None, **kwargs: Any
+    ) -> DocumentConverterResult:
+        """
+        Convert content that is already in memory, without writing it to disk first.
+        Converters that support it (supports_bytes) are handed the bytes directly. The
+        data is only spilled to a temporary file if a converter that needs a path is reached.
+
+        Args:
+            - data: the raw file content
+            - hint_ext: the file extension to try first, e.g. from an upload's filename
+        """
+        # Prepare a list of extensions to try (in order of priority)
+        ext = kwargs.get("file_extension")
+        extensions = []
+        self._append_ext(extensions, ext)
+        self._append_ext(extensions, hint_ext)
+
+        # Use puremagic on the buffer itself to check for more extension options
+        for g in _guess_ext_magic_bytes(data):
+            self._append_ext(extensions, g)
+
+        # Convert
+        return self._convert(None, extensions, data=data, **kwargs)
 
     def convert_url(
         self, url: str, **kwargs: Any
@@ -196,7 +313,7 @@ class MarkItDown:
 
         # Read the content disposition if there is one
         content_disposition = response.headers.get("content-disposition", "")
-        m = re.search(r"filename=([^;]+)", content_disposition)
+        m = _CONTENT_DISPOSITION_FILENAME_RE.search(content_disposition)
         if m:
             base, ext = os.path.splitext(m.group(1).strip("\"'"))
             self._append_ext(extensions, ext)
@@ -206,89 +323,111 @@ class MarkItDown:
         self._append_ext(extensions, ext)
 
         # Save the file locally to a temporary file. It will be deleted before this method exits
-        handle, temp_path = tempfile.mkstemp()
-        fh = os.fdopen(handle, "wb")
-        result = None
+        fh = tempfile.NamedTemporaryFile(delete=False)
+        temp_path = fh.name
         try:
             # Download the file
-            for chunk in response.iter_content(chunk_size=512):
-                fh.write(chunk)
-            fh.close()
+            with fh:
+                for chunk in response.iter_content(chunk_size=_COPY_CHUNK_SIZE):
+                    fh.write(chunk)
 
             # Use puremagic to check for more extension options
             for g in self._guess_ext_magic(temp_path):
                 self._append_ext(extensions, g)
 
             # Convert
-            result = self._convert(temp_path, extensions, url=response.url, **kwargs)
+            return self._convert(temp_path, extensions, url=response.url, **kwargs)
         # Clean up
         finally:
-            try:
-                fh.close()
-            except Exception:
-                pass
             os.unlink(temp_path)
 
-        return result
-
     def _convert(
-        self, local_path: str, extensions: List[Union[str, None]], **kwargs
+        self,
+        local_path: Optional[str],
+        extensions: List[Union[str, None]],
+        data: Optional[bytes] = None,
+        **kwargs,
     ) -> DocumentConverterResult:
+        """Try the converters for each extension in turn. Pass either a local_path, or
+        data with local_path None; in the latter case the data is written to a temporary
+        file the first time a converter without supports_bytes needs a path."""
         error_trace = ""
-        for ext in extensions + [None]:  # Try last with no extension
-            for converter in self._page_converters:
-                _kwargs = copy.deepcopy(kwargs)
-
-                # Overwrite file_extension appropriately
-                if ext is None:
-                    if "file_extension" in _kwargs:
-                        del _kwargs["file_extension"]
-                else:
-                    _kwargs.update({"file_extension": ext})
+        temp_path = None
+        source = local_path if local_path is not None else "<bytes>"
 
-                # Copy any additional global options
-                if "llm_client" not in _kwargs and self._llm_client is not None:
-                    _kwargs["llm_client"] = self._llm_client
+        # Build the shared keyword arguments once. Converters receive them unpacked (**),
+        # so each call gets its own dict and a shallow copy is enough.
+        base_kwargs = dict(kwargs)
+        base_kwargs.pop("file_extension", None)
 
-                if "llm_model" not in _kwargs and self._llm_model is not None:
-                    _kwargs["llm_model"] = self._llm_model
+        # Copy any additional global options
+        if "llm_client" not in base_kwargs and self._llm_client is not None:
+            base_kwargs["llm_client"] = self._llm_client
 
-                if "style_map" not in _kwargs and self._style_map is not None:
-                    _kwargs["style_map"] = self._style_map
+        if "llm_model" not in base_kwargs and self._llm_model is not None:
+            base_kwargs["llm_model"] = self._llm_model
 
-                if "exiftool_path" not in _kwargs and self._exiftool_path is not None:
-                    _kwargs["exiftool_path"] = self._exiftool_path
+        if "style_map" not in base_kwargs and self._style_map is not None:
+            base_kwargs["style_map"] = self._style_map
 
-                # Add the list of converters for nested processing
-                _kwargs["_parent_converters"] = self._page_converters
+        if "exiftool_path" not in base_kwargs and self._exiftool_path is not None:
+            base_kwargs["exiftool_path"] = self._exiftool_path
 
-                # If we hit an error log it and keep trying
-                try:
-                    res = converter.convert(local_path, **_kwargs)
-                except Exception:
-                    error_trace = ("\n\n" + traceback.format_exc()).strip()
+        # Add the list of converters for nested processing
+        base_kwargs["_parent_converters"] = self._page_converters
 
-                if res is not None:
-                    # Normalize the content
-                    res.text_content = "\n".join(
-                        [line.rstrip() for line in re.split(r"\r?\n", res.text_content)]
-                    )
-                    res.text_content = re.sub(r"\n{3,}", "\n\n", res.text_content)
+        try:
+            for ext in extensions + [None]:  # Try last with no extension
+                # Overwrite file_extension appropriately
+                _kwargs = base_kwargs if ext is None else {**base_kwargs, "file_extension": ext}
 
-                    # Todo
-                    return res
+                for converter in self._converters_for(ext):
+                    # If we hit an error log it and keep trying
+                    res = None
+                    try:
+                        if local_path is None and converter.supports_bytes:
+                            res = converter.convert_bytes(data, **_kwargs)
+                        else:
+                            if local_path is None:
+                                local_path = temp_path = self._spill_to_temp_file(data, extensions[0] if extensions else "")
+                            res = converter.convert(local_path, **_kwargs)
+                    except Exception:
+                        error_trace = ("\n\n" + traceback.format_exc()).strip()
+
+                    if res is not None:
+                        # Normalize the content
+                        # Splitting on "\n" is enough: rstrip also drops the "\r" of "\r\n"
+                        res.text_content = "\n".join(
+                            [line.rstrip() for line in res.text_content.split("\n")]
+                        )
+                        res.text_content = _BLANK_LINES_RE.sub("\n\n", res.text_content)
+
+                        # Todo
+                        return res
+        # Clean up
+        finally:
+            if temp_path is not None:
+                os.unlink(temp_path)
 
         # If we got this far without success, report any exceptions
         if len(error_trace) > 0:
             raise FileConversionException(
-                f"Could not convert '{local_path}' to Markdown. File type was recognized as {extensions}. While converting the file, the following error was encountered:\n\n{error_trace}"
+                f"Could not convert '{source}' to Markdown. File type was recognized as {extensions}. While converting the file, the following error was encountered:\n\n{error_trace}"
             )
 
         # Nothing can handle it!
         raise UnsupportedFormatException(
-            f"Could not convert '{local_path}' to Markdown. The formats {extensions} are not supported."
+            f"Could not convert '{source}' to Markdown. The formats {extensions} are not supported."
         )
 
+    @staticmethod
+    def _spill_to_temp_file(data: bytes, suffix: str = "") -> str:
+        """Write in-memory content to a temporary file for converters that need a path.
+        The most likely extension is kept as the suffix for libraries that look at file names."""
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as fh:
+            fh.write(data)
+        return fh.name
+
     def _append_ext(self, extensions, ext):
         """Append a unique non-None, non-empty extension to a list of extensions."""
         if ext is None:
@@ -296,42 +435,18 @@ class MarkItDown:
         ext = ext.strip()
         if ext == "":
             return
-        # if ext not in extensions:
+        # Converters match extensions case-insensitively, so ".PDF" and ".pdf" are the same candidate.
+        # The list only ever holds a handful of entries, so a linear scan is cheaper than a side set.
+        if any(ext.lower() == seen.lower() for seen in extensions):
+            return
         extensions.append(ext)
 
     def _guess_ext_magic(self, path):
         """Use puremagic (a Python implementation of libmagic) to guess a file's extension based on the first few bytes."""
-        # Use puremagic to guess
         try:
-            guesses = puremagic.magic_file(path)
-
-            # Fix for: https://github.com/microsoft/markitdown/issues/222
-            # If there are no guesses, then try again after trimming leading ASCII whitespaces.
-            # ASCII whitespace characters are those byte values in the sequence b' \t\n\r\x0b\f'
-            # (space, tab, newline, carriage return, vertical tab, form feed).
-            if len(guesses) == 0:
-                with open(path, "rb") as file:
-                    while True:
-                        char = file.read(1)
-                        if not char:  # End of file
-                            break
-                        if not char.isspace():
-                            file.seek(file.tell() - 1)
-                            break
-                    try:
-                        guesses = puremagic.magic_stream(file)
-                    except puremagic.main.PureError:
-                        pass
-
-            extensions = list()
-            for g in guesses:
-                ext = g.extension.strip()
-                if len(ext) > 0:
-                    if not ext.startswith("."):
-                        ext = "." + ext
-                    if ext not in extensions:
-                        extensions.append(ext)
-            return extensions
+            # Key the cache on the file's identity and version so changed files are sniffed again
+            st = os.stat(path)
+            return list(_guess_ext_magic_cached(path, st.st_size, st.st_mtime_ns, st.st_ino))
         except FileNotFoundError:
             pass
         except IsADirectoryError:
@@ -340,6 +455,22 @@ class MarkItDown:
             pass
         return []
 
+    def _converters_for(self, ext: Optional[str]) -> List[DocumentConverter]:
+        """Return the converters that may handle the given extension, in priority order."""
+        if ext is None:
+            return self._generic_converters
+        return self._converters_by_extension.get(ext.lower(), self._generic_converters)
+
     def register_page_converter(self, converter: DocumentConverter) -> None:
         """Register a page text converter."""
         self._page_converters.insert(0, converter)
+
+        # Later registrations take priority, so they go to the front of every list they join
+        if converter.extensions is None:
+            self._generic_converters.insert(0, converter)
+            for converters in self._converters_by_extension.values():
+                converters.insert(0, converter)
+        else:
+            for ext in converter.extensions:
+                converters = self._converters_by_extension.setdefault(ext, list(self._generic_converters))
+                converters.insert(0, converter)
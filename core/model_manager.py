@@ -1,5 +1,7 @@
 import json
 import os
+import stat
+import tempfile
 from pathlib import Path
 
 DEFAULT_CONFIG_NAME = "magic-pdf.json"
@@ -38,11 +40,31 @@ class ModelConfigurator:
         if self.config_path.exists():
             with open(self.config_path, 'r') as f:
                 existing_config = json.load(f)
-            existing_config.update(template_config)
-            config = existing_config
+            config = {**existing_config, **template_config}
+            # 配置没有变化时不重写文件
+            if config == existing_config:
+                print(f"配置文件未变化: {self.config_path}")
+                return
         else:
             config = template_config
 
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-            print(f"配置文件生成于: {self.config_path}")
+        # 先写临时文件再原子替换，避免进程中断留下写了一半的配置文件；
+        # 解析符号链接，替换链接指向的文件而不是链接本身
+        target = self.config_path.resolve()
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+        try:
+            # mkstemp 创建的文件权限为 0600，改为沿用原文件权限，新文件按 umask 默认权限
+            if target.exists():
+                mode = stat.S_IMODE(os.stat(target).st_mode)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.fchmod(fd, mode)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(config, f, indent=2)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        print(f"配置文件生成于: {self.config_path}")
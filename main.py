@@ -1,22 +1,31 @@
-import io
+import asyncio
+import contextlib
+import json
 import os
+import re
+import tempfile
+import threading
+import time
 import uuid
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 import openai
 from fastapi import FastAPI, UploadFile, File, HTTPException, status, Depends, BackgroundTasks, Form, Query
-from fastapi.responses import FileResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from fastapi.staticfiles import StaticFiles
 
 from core.markitdown import MarkItDown
-from core.base import DocumentConverterResult
+from core.base import DocumentConverterResult, FileConversionException, UnsupportedFormatException
 from core.model_manager import ModelConfigurator
-from repository.db import get_db, Job
+from repository.db import get_db, Job, SessionLocal
 
 # 安全验证
 security = HTTPBearer()
@@ -24,8 +33,38 @@ security = HTTPBearer()
 # 从环境变量获取API密钥
 API_KEY = os.getenv("MARKIT_API_KEY", "secret-key")
 OUTPUT_DIR = Path("output")
-OUTPUT_DIR.mkdir(exist_ok=True)
+IMAGES_DIR = OUTPUT_DIR / "images"
+# 一次调用创建 output/ 与 output/images，目录已存在时不报错（多进程同时启动也安全）
+IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 port = int(os.getenv("PORT", 20926))
+# 允许跨域访问的前端来源（逗号分隔），如 Streamlit 页面 http://localhost:8501；未设置时不开放跨域
+CORS_ORIGINS = [o.strip() for o in os.getenv("MARKIFY_CORS_ORIGINS", "").split(",") if o.strip()]
+# SSE 心跳间隔（秒），防止代理因空闲断开连接
+SSE_HEARTBEAT_INTERVAL = 30
+# 单个 SSE 连接的最长存活时间（秒），到期后由服务端结束，浏览器 EventSource 会自动重连；
+# 否则常驻的订阅连接会阻止 uvicorn 正常关闭
+SSE_STREAM_LIFETIME = 300
+# 浏览器在连接结束后的重连等待时间（毫秒）
+SSE_RETRY_MS = 1000
+# 关闭服务时等待未完成连接的最长时间（秒），超时后强制关闭，保证生命周期清理逻辑得以执行
+GRACEFUL_SHUTDOWN_TIMEOUT = 10
+# 上传文件分块写盘的块大小
+UPLOAD_CHUNK_SIZE = 1 << 20
+# 不超过该大小的上传直接在内存中转换（convert_bytes），不落盘；更大的文件流式写入临时文件
+INMEMORY_UPLOAD_LIMIT = 1 << 20
+# 上传临时文件的文件名前缀（位于 output/ 下，处理结束后删除）
+UPLOAD_PREFIX = "upload_"
+# 同时执行的转换任务上限，超出的任务排队等待
+MAX_CONCURRENT_JOBS = int(os.getenv("MARKIFY_MAX_CONCURRENT_JOBS", os.cpu_count() or 1))
+# 已是 Markdown 的文件直接原样保存，不经过转换流程（避免行尾空格等格式被规范化掉）
+MARKDOWN_EXTENSIONS = frozenset({".md", ".markdown"})
+# output/ 清理：每隔 OUTPUT_GC_INTERVAL 秒删除超过 OUTPUT_TTL_HOURS 小时的文件，0 表示不按时间清理
+OUTPUT_GC_INTERVAL = 3600
+OUTPUT_TTL_HOURS = float(os.getenv("MARKIFY_OUTPUT_TTL_HOURS", 7 * 24))
+# 本服务写入 output/ 的结果文件名（<任务 ID>.md，任务 ID 为 uuid4）；其他文件（如 MinerU 的 <pdf名>.md）不清理
+RESULT_FILE_RE = re.compile(r"(?P<job_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\.md")
+# Markdown 中对 output/images 下图片的引用（相对路径 images/xxx 或 /images/xxx 链接），取文件名
+IMAGE_REF_RE = re.compile(r"images/(?:[^)\s\"'/]+/)*([^)\s\"'/]+)")
 
 # 依赖项：API Key 验证
 async def verify_api_key(
@@ -39,6 +78,78 @@ async def verify_api_key(
     return credentials
 
 
+def _cleanup_output_dir():
+    """清理本服务写入的文件：删除过期的结果和残留的上传临时文件、任务记录已不存在的结果文件，
+    以及不再被任何 Markdown 引用的过期图片
+
+    output/ 下只处理任务结果（<任务 ID>.md）和上传临时文件（upload_*），其他文件一律保留；
+    output/images 中的图片可能被保留下来的 Markdown（如 MinerU 的 <pdf名>.md）引用，仍被引用的不删除"""
+    cutoff = time.time() - OUTPUT_TTL_HOURS * 3600 if OUTPUT_TTL_HOURS > 0 else None
+    results = {}
+    removed = 0
+
+    with os.scandir(OUTPUT_DIR) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            match = RESULT_FILE_RE.fullmatch(entry.name)
+            if match is None and not entry.name.startswith(UPLOAD_PREFIX):
+                continue
+            if cutoff is not None and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+                    removed += 1
+            elif match is not None:
+                results[match.group("job_id")] = entry.path
+
+    # 结果文件名即任务 ID，删除找不到对应任务的结果
+    if results:
+        with SessionLocal() as db:
+            known = {job_id for job_id, in db.query(Job.id).filter(Job.id.in_(list(results)))}
+        for job_id, path in results.items():
+            if job_id not in known:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+                    removed += 1
+
+    if cutoff is None:
+        return removed
+
+    # 过期图片：只删除清理后剩余的 Markdown 都不再引用的图片
+    expired_images = {}
+    with os.scandir(IMAGES_DIR) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                expired_images[entry.name] = entry.path
+    if expired_images:
+        with os.scandir(OUTPUT_DIR) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith(".md"):
+                    with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                        for name in IMAGE_REF_RE.findall(f.read()):
+                            expired_images.pop(name, None)
+                    if not expired_images:
+                        break
+        for path in expired_images.values():
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+                removed += 1
+
+    return removed
+
+
+async def _output_gc_loop():
+    """定期在线程中执行 output/ 清理，直到被取消"""
+    while True:
+        try:
+            removed = await asyncio.to_thread(_cleanup_output_dir)
+            if removed:
+                print(f"已清理 output/ 下 {removed} 个文件")
+        except Exception as e:
+            print(f"清理 output/ 失败: {str(e)}")
+        await asyncio.sleep(OUTPUT_GC_INTERVAL)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """服务启动和关闭时的生命周期管理"""
@@ -51,17 +162,23 @@ async def lifespan(app: FastAPI):
         print(f"模型初始化失败: {str(e)}")
         raise
 
+    gc_task = asyncio.create_task(_output_gc_loop())
+
     yield  # 应用运行期间
 
     # 清理逻辑（可选）
     print("服务关闭，清理资源...")
+    gc_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await gc_task
 
 
 # FastAPI 应用
 app = FastAPI(lifespan=lifespan)
-if not os.path.exists("output/images"):
-    os.mkdir("output/images")
-app.mount("/images", StaticFiles(directory="output/images"), name="images")
+if CORS_ORIGINS:
+    # 浏览器中的任务流组件（EventSource）直接请求后端，只对配置的来源开放
+    app.add_middleware(CORSMiddleware, allow_origins=CORS_ORIGINS, allow_methods=["GET"])
+app.mount("/images", StaticFiles(directory=IMAGES_DIR), name="images")
 
 
 # 数据模型
@@ -79,6 +196,54 @@ class JobResultResponse(BaseModel):
     format: str
 
 
+class JobEventBroker:
+    """任务状态变更广播器，后台任务线程通知，SSE 订阅者在事件循环中等待"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        # 队列长度为 1：订阅者只关心"有变化"，多次变化合并为一次
+        queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers = {(loop, q) for loop, q in self._subscribers if q is not queue}
+
+    def notify(self):
+        """通知所有订阅者任务状态已变化，可在任意线程调用"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue):
+        if queue.empty():
+            queue.put_nowait(True)
+
+
+job_events = JobEventBroker()
+
+
+def _job_to_response(job: Job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.id,
+        status=job.status,
+        filename=job.filename,
+        params=job.params,
+        error=job.error
+    )
+
+
 oai_client = None
 if os.getenv("MARKIFY_LLM_API_KEY", None) and os.getenv("MARKIFY_LLM_API_BASE", None):
     oai_client = openai.OpenAI(
@@ -86,48 +251,95 @@ if os.getenv("MARKIFY_LLM_API_KEY", None) and os.getenv("MARKIFY_LLM_API_BASE",
         base_url=os.getenv("MARKIFY_LLM_API_BASE", None)
     )
 
+# 支持的转换模式；缓存按模式区分，只接受这几个值，避免任意 mode 不断创建新实例
+SUPPORTED_MODES = frozenset({"simple", "advanced", "cloud"})
 
-def process_file(db: Session, job_id: str, file_content: bytes, filename: str, mode: str = "simple"):
-    """处理各种文件的后台任务"""
-    try:
-        # 更新任务状态为 processing
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if not job:
-            raise ValueError(f"Job {job_id} not found")
+# 每种模式复用一个 MarkItDown 实例，避免每个任务都重新创建全部转换器
+_MD_CACHE: Dict[str, MarkItDown] = {}
+_MD_CACHE_LOCK = threading.Lock()
 
-        job.status = "processing"
-        db.commit()
 
-        # 创建处理器
-        markitdown = MarkItDown(
-            mode=mode,
-            llm_client=oai_client,
-            llm_model=os.getenv("MARKIFY_LLM_MODEL", None)
-        )
+def get_markitdown(mode: str) -> MarkItDown:
+    """获取指定模式的 MarkItDown 实例，首次使用时创建"""
+    with _MD_CACHE_LOCK:
+        markitdown = _MD_CACHE.get(mode)
+        if markitdown is None:
+            markitdown = MarkItDown(
+                mode=mode,
+                llm_client=oai_client,
+                llm_model=os.getenv("MARKIFY_LLM_MODEL", None)
+            )
+            _MD_CACHE[mode] = markitdown
+        return markitdown
 
-        # 根据输入类型处理
-        if filename.endswith('.md'):
-            result = DocumentConverterResult(text_content=file_content.decode('utf-8'))
-        else:
-            # 将字节内容转为文件流
-            file_stream = io.BytesIO(file_content)
-            result = markitdown.convert_stream(file_stream, base_url="http://localhost:20926")
-
-        # 保存结果到文件
-        output_file = OUTPUT_DIR / f"{job_id}.md"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(result.text_content)
-
-        # 更新任务状态为 completed
-        job.status = "completed"
-        job.result_file = str(output_file)
-        db.commit()
 
-    except Exception as e:
-        # 更新任务状态为 failed
-        job.status = "failed"
-        job.error = f"{type(e).__name__}: {str(e)}"
-        db.commit()
+def _update_job(db: Session, job_id: str, **values) -> bool:
+    """以单条 UPDATE 语句更新任务状态并通知订阅者，返回任务是否存在"""
+    result = db.execute(update(Job).where(Job.id == job_id).values(**values))
+    db.commit()
+    job_events.notify()
+    return result.rowcount > 0
+
+
+def process_file(
+        job_id: str,
+        filename: str,
+        mode: str = "simple",
+        file_path: Optional[str] = None,
+        data: Optional[bytes] = None
+):
+    """处理各种文件的后台任务；上传内容为临时文件 file_path 或内存中的 data，处理结束后删除临时文件
+
+    在请求结束后运行，因此使用自己的数据库会话，而不是请求的会话（该会话此时已关闭）"""
+    with SessionLocal() as db:
+        try:
+            # 更新任务状态为 processing
+            if not _update_job(db, job_id, status="processing"):
+                raise ValueError(f"Job {job_id} not found")
+
+            # 获取处理器
+            markitdown = get_markitdown(mode)
+
+            # 根据输入类型处理
+            suffix = Path(filename).suffix
+            if suffix.lower() in MARKDOWN_EXTENSIONS:
+                if data is not None:
+                    text = data.decode("utf-8-sig", errors="replace")
+                else:
+                    with open(file_path, "r", encoding="utf-8-sig", errors="replace") as f:
+                        text = f.read()
+                result = DocumentConverterResult(text_content=text)
+            elif data is not None:
+                result = markitdown.convert_bytes(data, hint_ext=suffix, base_url="http://localhost:20926")
+            else:
+                result = markitdown.convert_local(file_path, base_url="http://localhost:20926")
+
+            # 保存结果到文件
+            output_file = OUTPUT_DIR / f"{job_id}.md"
+            with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.write(result.text_content)
+
+            # 更新任务状态为 completed
+            _update_job(db, job_id, status="completed", result_file=str(output_file))
+
+        # 转换异常继承自 BaseException，需要单独捕获，否则任务会一直停留在 processing
+        except (Exception, FileConversionException, UnsupportedFormatException) as e:
+            # 更新任务状态为 failed
+            db.rollback()
+            _update_job(db, job_id, status="failed", error=f"{type(e).__name__}: {str(e)}")
+
+        finally:
+            if file_path is not None:
+                os.unlink(file_path)
+
+
+job_semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+
+async def run_job(**kwargs):
+    """在线程中执行转换任务；排队在事件循环上等待，不占用线程池线程"""
+    async with job_semaphore:
+        await asyncio.to_thread(process_file, **kwargs)
 
 
 @app.post("/api/jobs", status_code=status.HTTP_202_ACCEPTED)
@@ -138,12 +350,29 @@ async def upload_file(
         db: Session = Depends(get_db)
 ):
     """上传文件并启动转换任务"""
+    if mode not in SUPPORTED_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported mode: {mode}"
+        )
+
     # 生成任务ID
     job_id = str(uuid.uuid4())
+    file_path = None
+    data = None
 
     try:
-        # 读取文件内容
-        content = await file.read()
+        if file.size is not None and file.size <= INMEMORY_UPLOAD_LIMIT:
+            # 小文件直接保留在内存中，转换时无需经过临时文件
+            data = await file.read()
+        else:
+            # 分块写入临时文件，避免将整个上传内容读入内存；保留原扩展名便于识别格式
+            with tempfile.NamedTemporaryFile(
+                    delete=False, dir=OUTPUT_DIR, prefix=UPLOAD_PREFIX, suffix=Path(file.filename or "").suffix
+            ) as tmp:
+                file_path = tmp.name
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    tmp.write(chunk)
 
         # 创建任务记录
         job = Job(
@@ -154,20 +383,23 @@ async def upload_file(
         )
         db.add(job)
         db.commit()
+        job_events.notify()
 
         # 启动后台任务
         background_tasks.add_task(
-            process_file,
-            db=db,
+            run_job,
             job_id=job_id,
-            file_content=content,
             filename=file.filename,
-            mode=mode
+            mode=mode,
+            file_path=file_path,
+            data=data
         )
 
         return {"job_id": job_id}
 
     except Exception as e:
+        if file_path and os.path.exists(file_path):
+            os.unlink(file_path)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"File upload failed: {str(e)}"
@@ -188,16 +420,49 @@ async def list_jobs(
             detail="Job not found"
         )
 
-    response_list = []
-    for job in jobs:
-        response_list.append(JobStatusResponse(
-            job_id=job.id,
-            status=job.status,
-            filename=job.filename,
-            params=job.params,
-            error=job.error
-        ))
-    return response_list
+    return [_job_to_response(job) for job in jobs]
+
+
+@app.get("/api/jobs/stream")
+async def stream_jobs(
+        limit: int = Query(10, gt=0, le=100, description="default 10，max 100")
+):
+    """以 SSE 推送最新任务列表，任务状态变化时推送，空闲时发送心跳；连接最长保持 SSE_STREAM_LIFETIME 秒"""
+
+    def load_jobs():
+        db = SessionLocal()
+        try:
+            jobs = db.query(Job).order_by(Job.created_at.desc()).limit(limit).all()
+            return jsonable_encoder([_job_to_response(job) for job in jobs])
+        finally:
+            db.close()
+
+    async def event_stream():
+        queue = job_events.subscribe()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_STREAM_LIFETIME
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                jobs = await asyncio.to_thread(load_jobs)
+                yield f"data: {json.dumps(jobs, ensure_ascii=False)}\n\n"
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        return
+                    try:
+                        await asyncio.wait_for(queue.get(), timeout=min(SSE_HEARTBEAT_INTERVAL, remaining))
+                        break
+                    except asyncio.TimeoutError:
+                        yield ": ping\n\n"
+        finally:
+            job_events.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 
 @app.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
@@ -213,13 +478,7 @@ async def get_job_status(
             detail="Job not found"
         )
 
-    return JobStatusResponse(
-        job_id=job.id,
-        status=job.status,
-        filename=job.filename,
-        params=job.params,
-        error=job.error
-    )
+    return _job_to_response(job)
 
 
 @app.get("/api/jobs/{job_id}/result")
@@ -241,8 +500,13 @@ async def download_result(
             detail="Job not completed"
         )
 
+    # 只 stat 一次，并把结果交给 FileResponse，省去它自己的 stat
     result_file = job.result_file
-    if not result_file or not os.path.exists(result_file):
+    try:
+        stat_result = os.stat(result_file) if result_file else None
+    except OSError:
+        stat_result = None
+    if stat_result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Result file not found"
@@ -252,11 +516,12 @@ async def download_result(
     return FileResponse(
         result_file,
         filename=f"{job.filename}.md",
-        media_type="text/markdown"
+        media_type="text/markdown",
+        stat_result=stat_result
     )
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port, timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, String, Integer, JSON, DateTime
+from sqlalchemy import create_engine, event, Column, String, Integer, JSON, DateTime, Index
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -9,6 +9,18 @@ DATABASE_URL = "sqlite:///./jobs.db"
 # 创建数据库引擎
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """WAL 模式下读写互不阻塞；synchronous=NORMAL 减少每次提交的 fsync"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
 # 创建 SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -29,9 +41,17 @@ class Job(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # 任务列表按创建时间倒序分页
+        Index("ix_jobs_created_at", created_at.desc()),
+    )
+
 
 # 创建数据库表
 Base.metadata.create_all(bind=engine)
+# create_all 不会为已存在的表补建索引
+for index in Job.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
 
 
 # 获取数据库会话